@@ -1,29 +1,41 @@
+import functools
 import glob
 import json
 import os
 import re
-from collections import OrderedDict
 from pathlib import Path
 
 import confuse
-import jsonpath_rw
 import yaml
 from beets import config, ui
 from beets.autotag import current_metadata
 from beets.plugins import BeetsPlugin
-
-BEETS_TO_LABEL = OrderedDict(
-    [
-        ("artist", "Artist"),
-        ("album", "Name"),
-        ("media", "Media"),
-        ("year", "Edition year"),
-        ("country", "Country"),
-        ("label", "Record label"),
-        ("catalognum", "Catalog number"),
-        ("albumdisambig", "Edition"),
-    ]
-)
+from jsonpath_ng import parse as parse_jsonpath
+
+# orjson is an optional, faster parser for JSON origin files.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+BEETS_TO_LABEL = {
+    "artist": "Artist",
+    "album": "Name",
+    "media": "Media",
+    "year": "Edition year",
+    "country": "Country",
+    "label": "Record label",
+    "catalognum": "Catalog number",
+    "albumdisambig": "Edition",
+}
+
+LABEL_LENGTHS = {k: len(v) for k, v in BEETS_TO_LABEL.items()}
 
 # Conflicts will be reported if any of these fields don't match.
 CONFLICT_FIELDS = ["catalognum", "media", "artist"]
@@ -34,23 +46,107 @@ SUPPORTED_METADATA_SOURCES = ["musicbrainz", "discogs"]
 # Supported providers for URL extraction from origin files
 SUPPORTED_PROVIDERS = ["discogs", "bandcamp"]
 
+# Doubles braces so messages are not treated as log format strings
+BRACE_ESCAPES = str.maketrans({"{": "{{", "}": "}}"})
+
+# Characters ignored when comparing catalog numbers
+CATNO_SEPARATORS = str.maketrans("", "", " -")
+
+# A JSONPath child field lookup: .name, .'quoted name' or ."quoted name"
+JSONPATH_FIELD = r"""\.(?:([A-Za-z_][A-Za-z0-9_]*)|'([^'\\]*)'|"([^"\\]*)")"""
+
+# JSONPath expressions made up only of child field lookups, e.g. "$.info.catalognum"
+SIMPLE_JSONPATH = re.compile(rf"^\$?(?:{JSONPATH_FIELD})+$")
+
+# Line endings recognised when reading text origin files, as in universal newlines
+# mode. str.splitlines() would also split on form feeds and other separators.
+LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# orjson parses integers outside the 64-bit range as floats, so documents with
+# numbers this long are left to the stdlib parser.
+LONG_NUMBER = re.compile(rb"\d{19,}")
+
+# Characters that end the literal prefix of a regex
+REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
 
 def escape_braces(string):
-    return string.replace("{", "{{").replace("}", "}}")
+    return string.translate(BRACE_ESCAPES)
 
 
 def normalize_catno(catno):
-    return catno.upper().replace(" ", "").replace("-", "")
+    return catno.translate(CATNO_SEPARATORS).upper()
+
+
+def split_first(value):
+    # Keep only the first entry of a "," or "/" separated list.
+    return value.split(",", 1)[0].split("/", 1)[0].strip()
+
+
+# Cleanup applied to origin values, by tag
+SANITIZERS = {
+    "media": lambda value: "Digital Media" if value == "WEB" else value,
+    "catalognum": split_first,
+    "label": split_first,
+    "year": lambda value: "" if value == "0" else value,
+}
 
 
 def sanitize_value(key, value):
-    if key == "media" and value == "WEB":
-        return "Digital Media"
-    if key == "catalognum" or key == "label":
-        return re.split("[,/]", value)[0].strip()
-    if key == "year" and value == "0":
+    sanitizer = SANITIZERS.get(key)
+    return sanitizer(value) if sanitizer else value
+
+
+def literal_prefix(pattern):
+    """
+    Return the literal text that every match of a regex must start with.
+
+    Only the leading run of plain characters is considered, so an empty string is
+    returned whenever the prefix can't be determined cheaply (alternations, inline
+    flags, escapes, groups, ...).
+    """
+    if "|" in pattern or re.search(r"\(\?[aiLmsux]+\)", pattern):
         return ""
-    return value
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    for i, char in enumerate(pattern):
+        if char in REGEX_METACHARS:
+            # These quantifiers make the preceding character optional.
+            if char in "*?{":
+                i = max(i - 1, 0)
+            return pattern[:i]
+    return pattern
+
+
+def simple_jsonpath_fields(pattern):
+    """
+    Return the field names of a JSONPath expression that only looks up child
+    fields (e.g. "$.info.'Catalog number'" -> ("info", "Catalog number")), or None
+    for any other expression.
+    """
+    if not SIMPLE_JSONPATH.match(pattern):
+        return None
+    return tuple("".join(field) for field in re.findall(JSONPATH_FIELD, pattern))
+
+
+def read_origin(origin_path):
+    # Read the whole file at once; parsers are fed bytes directly.
+    with open(origin_path, "rb") as f:
+        return f.read()
+
+
+def load_json(data):
+    """
+    Parse JSON bytes with orjson when it is installed, falling back to the stdlib
+    parser for anything orjson would read differently: integers wider than 64
+    bits, and NaN/Infinity or other input it rejects but the stdlib accepts.
+    """
+    if orjson is not None and not LONG_NUMBER.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 def scan_file_for_metadata_urls(file_path, provider):
@@ -88,9 +184,24 @@ def scan_file_for_metadata_urls(file_path, provider):
     return None
 
 
+@functools.cache
+def color_codes(color_name):
+    """
+    Return the escape codes beets puts before and after text for a color, so the
+    color config only has to be looked up once per color.
+    """
+    prefix, _, suffix = ui.colorize(color_name, "\x00").partition("\x00")
+    return prefix, suffix
+
+
+def colorize(color_name, text):
+    prefix, suffix = color_codes(color_name)
+    return f"{prefix}{text}{suffix}"
+
+
 def highlight(text, active=True):
     if active:
-        return ui.colorize("text_highlight_minor", text)
+        return colorize("text_highlight_minor", text)
     return text
 
 
@@ -124,6 +235,7 @@ class OriginQuery(BeetsPlugin):
                 f"At least one source must have extra_tags configured."
             )
 
+        self.extra_tags_set = frozenset(self.extra_tags)
         self.info(f"Using extra tags from: {self.extra_tags_source}")
         self.info(f"Available extra tags: {', '.join(self.extra_tags)}")
 
@@ -139,17 +251,20 @@ class OriginQuery(BeetsPlugin):
             )
 
         try:
-            self.origin_file = Path(self.config["origin_file"].get())
+            self.origin_file = str(Path(self.config["origin_file"].get()))
         except confuse.NotFoundError:
             return fail("Config error: originquery.origin_file not set.")
+        self.origin_file_is_glob = glob.has_magic(self.origin_file)
         self.tag_patterns = {}
+        # Field names for JSONPath patterns that can be looked up directly
+        self.field_paths = {}
 
         try:
             origin_type = (
                 self.config["origin_type"].as_choice(["yaml", "json", "text"]).lower()
             )
         except confuse.NotFoundError:
-            origin_type = self.origin_file.suffix.lower()[1:]
+            origin_type = os.path.splitext(self.origin_file)[1].lower()[1:]
 
         if origin_type == "json":
             self.match_fn = self.match_json
@@ -167,12 +282,15 @@ class OriginQuery(BeetsPlugin):
 
             if origin_type == "json" or origin_type == "yaml":
                 try:
-                    self.tag_patterns[key] = jsonpath_rw.parse(pattern)
+                    self.tag_patterns[key] = parse_jsonpath(pattern)
                 except Exception as e:
                     return fail(
                         f'Config error: invalid tag pattern for "{key}". '
                         f'"{pattern}" is not a valid JSON path ({format(str(e))}).'
                     )
+                fields = simple_jsonpath_fields(pattern)
+                if fields is not None:
+                    self.field_paths[key] = fields
                 continue
 
             try:
@@ -189,9 +307,28 @@ class OriginQuery(BeetsPlugin):
                     f'"{pattern}" must have exactly one capture group.'
                 )
 
+        self.prefix_pattern = None
+        self.text_prefixes = {}
+        if self.match_fn == self.match_text:
+            # A line can only match a pattern if it starts with its literal prefix,
+            # which is much cheaper to check than running the pattern.
+            self.text_prefixes = {
+                key: literal_prefix(p.pattern) for key, p in self.tag_patterns.items()
+            }
+            # If every pattern starts with a literal, lines starting with none of
+            # them can be skipped before they are stripped and fully matched. The
+            # leading \s* stands in for stripping the line.
+            prefixes = self.text_prefixes.values()
+            if all(prefixes):
+                self.prefix_pattern = re.compile(
+                    r"\s*(?:" + "|".join(map(re.escape, prefixes)) + ")"
+                )
+
         self.register_listener("import_task_start", self.import_task_start)
         self.register_listener("before_choose_candidate", self.before_choose_candidate)
         self.tasks = {}
+        # Table borders for print_tags, keyed by column widths
+        self.border_cache = {}
 
         try:
             self.use_origin_on_conflict = self.config["use_origin_on_conflict"].get(
@@ -215,10 +352,10 @@ class OriginQuery(BeetsPlugin):
             self.remove_conflicting_albumartist = False
 
     def error(self, msg):
-        self._log.error(escape_braces(ui.colorize("text_error", msg)))
+        self._log.error(escape_braces(colorize("text_error", msg)))
 
     def warn(self, msg):
-        self._log.warning(escape_braces(ui.colorize("text_warning", msg)))
+        self._log.warning(escape_braces(colorize("text_warning", msg)))
 
     def info(self, msg):
         # beets defaults to log level warning for event handlers.
@@ -229,22 +366,30 @@ class OriginQuery(BeetsPlugin):
         if items:
             headers = ["Field", "Tagged Data", "Origin Data"]
 
-            # Get field labels for import fields
-            w_key = max(len(headers[0]), *(len(BEETS_TO_LABEL[k]) for k, v in items))
-            w_tagged = max(len(headers[1]), *(len(str(v["tagged"])) for k, v in items))
-            w_origin = max(len(headers[2]), *(len(str(v["origin"])) for k, v in items))
+            # Size each column to fit its header and all field labels/values
+            w_key, w_tagged, w_origin = (len(header) for header in headers)
+            for k, v in items:
+                w_key = max(w_key, LABEL_LENGTHS[k])
+                w_tagged = max(w_tagged, len(str(v["tagged"])))
+                w_origin = max(w_origin, len(str(v["origin"])))
+
+            widths = (w_key, w_tagged, w_origin)
+            borders = self.border_cache.get(widths)
+            if borders is None:
+                borders = self.border_cache[widths] = tuple(
+                    f"{left}{fill * (w_key + 2)}{sep}{fill * (w_tagged + 2)}"
+                    f"{sep}{fill * (w_origin + 2)}{right}"
+                    for left, fill, sep, right in ("╔═╤╗", "╟─┼╢", "╚═╧╝")
+                )
+            top, middle, bottom = borders
 
-            self.info(
-                f"╔{'═' * (w_key + 2)}╤{'═' * (w_tagged + 2)}╤{'═' * (w_origin + 2)}╗"
-            )
+            self.info(top)
             self.info(
                 f"║ {headers[0].ljust(w_key)} │ "
                 f"{highlight(headers[1].ljust(w_tagged), use_tagged)} │ "
                 f"{highlight(headers[2].ljust(w_origin), not use_tagged)} ║"
             )
-            self.info(
-                f"╟{'─' * (w_key + 2)}┼{'─' * (w_tagged + 2)}┼{'─' * (w_origin + 2)}╢"
-            )
+            self.info(middle)
             for k, v in items:
                 if not v["tagged"] and not v["origin"]:
                     continue
@@ -255,9 +400,7 @@ class OriginQuery(BeetsPlugin):
                     f"{highlight(str(v['tagged']).ljust(w_tagged), tagged_active)} │ "
                     f"{highlight(str(v['origin']).ljust(w_origin), origin_active)} ║"
                 )
-            self.info(
-                f"╚{'═' * (w_key + 2)}╧{'═' * (w_tagged + 2)}╧{'═' * (w_origin + 2)}╝"
-            )
+            self.info(bottom)
 
     def before_choose_candidate(self, task, session):
         task_info = self.tasks[task]
@@ -300,38 +443,62 @@ class OriginQuery(BeetsPlugin):
         if conflict:
             self.warn("Origin data conflicts with tagged data.")
 
-    def match_text(self, origin_path):
-        with open(origin_path, encoding="utf-8") as f:
-            lines = f.readlines()
-
-        for key, pattern in self.tag_patterns.items():
-            for line in lines:
-                line = line.strip()
-                match = re.match(pattern, line)
+    def match_text(self, origin_path, satisfied=frozenset()):
+        # The caller adds keys it no longer needs values for to satisfied, so
+        # their patterns can be dropped for the rest of the file.
+        remaining = dict(self.tag_patterns)
+        for line in LINE_BREAK.split(read_origin(origin_path).decode("utf-8")):
+            if self.prefix_pattern and not self.prefix_pattern.match(line):
+                continue
+            line = line.strip()
+            for key, pattern in list(remaining.items()):
+                prefix = self.text_prefixes[key]
+                if prefix and not line.startswith(prefix):
+                    continue
+                match = pattern.match(line)
                 if not match:
                     continue
                 yield key, match[1]
-
-    def match_json(self, origin_path):
-        with open(origin_path, encoding="utf-8") as f:
-            data = json.load(f)
-
+                if key in satisfied:
+                    del remaining[key]
+            if not remaining:
+                return
+
+    def find_values(self, data):
+        """
+        Yield the first value found in data for each JSONPath tag pattern. Simple
+        field paths are resolved directly rather than through the JSONPath
+        evaluator.
+        """
         for key, pattern in self.tag_patterns.items():
-            match = pattern.find(data)
-            if not len(match):
+            fields = self.field_paths.get(key)
+            if fields is None:
+                match = pattern.find(data)
+                if len(match):
+                    yield key, match[0].value
                 continue
 
-            yield key, str(match[0].value)
+            value = data
+            try:
+                for field in fields:
+                    value = value[field]
+            except (KeyError, TypeError):
+                continue
+            yield key, value
 
-    def match_yaml(self, origin_path):
-        with open(origin_path, encoding="utf-8") as f:
-            data = yaml.load(f, Loader=yaml.SafeLoader)
+    def match_json(self, origin_path, satisfied=frozenset()):
+        data = load_json(read_origin(origin_path))
 
-        for key, pattern in self.tag_patterns.items():
-            match = pattern.find(data)
-            if not len(match) or not match[0].value:
+        for key, value in self.find_values(data):
+            yield key, str(value)
+
+    def match_yaml(self, origin_path, satisfied=frozenset()):
+        data = yaml.load(read_origin(origin_path), Loader=SafeLoader)
+
+        for key, value in self.find_values(data):
+            if not value:
                 continue
-            yield key, str(match[0].value)
+            yield key, str(value)
 
     def import_task_start(self, task, session):
         task_info = self.tasks[task] = {}
@@ -339,39 +506,45 @@ class OriginQuery(BeetsPlugin):
         # In case this is a multi-disc import, find the common parent directory.
         base = os.path.commonpath(task.paths).decode("utf8")
 
-        glob_pattern = os.path.join(glob.escape(base), self.origin_file)
-        origin_glob = sorted(glob.glob(glob_pattern))
+        if self.origin_file_is_glob:
+            glob_pattern = os.path.join(glob.escape(base), self.origin_file)
+            origin_glob = sorted(glob.glob(glob_pattern))
+        else:
+            # Without wildcards there is nothing to expand; just check the file.
+            candidate = os.path.join(base, self.origin_file)
+            origin_glob = [candidate] if os.path.isfile(candidate) else []
         if len(origin_glob) < 1:
-            task_info["origin_path"] = Path(base) / self.origin_file
+            task_info["origin_path"] = os.path.join(base, self.origin_file)
             task_info["missing_origin"] = True
             return
-        task_info["origin_path"] = origin_path = Path(origin_glob[0])
+        task_info["origin_path"] = origin_path = origin_glob[0]
 
         conflict = False
         likelies, consensus = current_metadata(task.items)
-        task_info["tag_compare"] = tag_compare = OrderedDict()
-        task_info["display_fields"] = display_fields = OrderedDict()
+        task_info["tag_compare"] = tag_compare = {}
+        task_info["display_fields"] = display_fields = {}
 
         # Build tag comparison for import fields (those in BEETS_TO_LABEL)
         for tag in BEETS_TO_LABEL:
-            tag_compare.update(
-                {
-                    tag: {
-                        "tagged": str(likelies.get(tag, "")),
-                        "active": tag in self.extra_tags,
-                        "origin": "",
-                    }
-                }
-            )
-
-        for key, value in self.match_fn(origin_path):
+            tag_compare[tag] = {
+                "tagged": str(likelies.get(tag, "")),
+                "active": tag in self.extra_tags_set,
+                "origin": "",
+            }
+
+        # Import fields that already have an origin value; later values for them
+        # are ignored, so match_fn can stop looking for them.
+        satisfied = set()
+        for key, value in self.match_fn(origin_path, satisfied):
             if key in BEETS_TO_LABEL:
                 # Handle import field
-                if tag_compare[key]["origin"]:
+                if key in satisfied:
                     continue
                 tagged_value = tag_compare[key]["tagged"]
                 origin_value = sanitize_value(key, value)
                 tag_compare[key]["origin"] = origin_value
+                if origin_value:
+                    satisfied.add(key)
 
                 # Only check conflicts for import fields that are in CONFLICT_FIELDS
                 if key not in CONFLICT_FIELDS or not tagged_value or not origin_value:
@@ -387,7 +560,14 @@ class OriginQuery(BeetsPlugin):
                 # Handle display field
                 display_fields[key] = value
 
-                # Extract metadata URLs from the entire origin file if enabled
+        # match_text yields in file order; show display fields in config order.
+        task_info["display_fields"] = {
+            key: display_fields[key]
+            for key in self.tag_patterns
+            if key in display_fields
+        }
+
+        # Extract metadata URLs from the entire origin file if enabled
         metadata_urls = {}
 
         # Check each supported provider's config and extract URLs
@@ -408,18 +588,24 @@ class OriginQuery(BeetsPlugin):
             self.info("No metadata URLs found in origin file")
 
         if not conflict or self.use_origin_on_conflict:
-            # Update all item with origin metadata.
+            # The origin metadata is the same for every item, so build it once.
+            updates = {}
+            for tag, entry in tag_compare.items():
+                origin_value = entry["origin"]
+                # Only update items with fields that are in extra_tags
+                if tag not in self.extra_tags_set:
+                    continue
+                if tag == "year" and origin_value:
+                    origin_value = int(origin_value) if origin_value.isdigit() else ""
+                updates[tag] = origin_value
+
+            # Store metadata URLs in extra_tags for plugin access
+            for provider, url in metadata_urls.items():
+                updates[f"metadata_urls_{provider}"] = url
+
+            # Update all items with origin metadata.
             for item in task.items:
-                for tag, entry in tag_compare.items():
-                    origin_value = entry["origin"]
-                    # Only update items with fields that are in extra_tags
-                    if tag not in self.extra_tags:
-                        continue
-                    if tag == "year" and origin_value:
-                        origin_value = (
-                            int(origin_value) if origin_value.isdigit() else ""
-                        )
-                    item[tag] = origin_value
+                item.update(updates)
 
                 # Apply the media removal workaround by default
                 # beets weighs media heavily, and will even prioritize a media match
@@ -436,10 +622,3 @@ class OriginQuery(BeetsPlugin):
                     self.info("Removing media field (has catalognum)")
                     del item["media"]
                     tag_compare["media"]["active"] = False
-
-                # Store metadata URLs in extra_tags for plugin access
-                if metadata_urls:
-                    for provider, url in metadata_urls.items():
-                        tag_name = f"metadata_urls_{provider}"
-                        # Store the single URL
-                        item[tag_name] = url
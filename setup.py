@@ -13,11 +13,14 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/x1ppy/beets-originquery",
-    python_requires=">=3.6",
+    python_requires=">=3.9",
     install_requires=[
         "beets>=1.5.0",
         "confuse",
-        "jsonpath-rw",
+        "jsonpath-ng",
         "pyyaml",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+    },
 )